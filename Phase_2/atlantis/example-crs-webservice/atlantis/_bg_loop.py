@@ -0,0 +1,34 @@
+# One persistent event loop on a daemon thread for all sync entry points.
+# asyncio.run() builds and tears down a loop per call, which dwarfs the actual
+# HTTP work for small requests and defeats the shared httpx connection pool
+# (pooled connections are bound to the loop that created them).
+import asyncio, threading
+
+try:
+    import uvloop
+    _LOOP = uvloop.new_event_loop()
+except ImportError:  # uvloop is linux-only; fall back to the stdlib loop
+    _LOOP = asyncio.new_event_loop()
+
+# The loop mostly hosts one short HTTP roundtrip at a time, so per-iteration
+# bookkeeping is a visible fraction of each call. Raise the slow-callback
+# threshold (avoids loop.time() accounting on every callback in debug mode)
+# and, on 3.12+, run tasks eagerly so coroutines that complete without
+# blocking (e.g. LLM cache hits) never go through the scheduler.
+_LOOP.slow_callback_duration = 1.0
+if hasattr(asyncio, "eager_task_factory"):
+    _LOOP.set_task_factory(asyncio.eager_task_factory)
+
+threading.Thread(target=_LOOP.run_forever, daemon=True, name="atlantis-bg-loop").start()
+
+def run_sync(coro):
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        # Blocking on .result() here would stall the caller's loop (or deadlock
+        # on the background loop itself); async callers must await directly.
+        coro.close()
+        raise RuntimeError("run_sync() called from inside an event loop; await the coroutine instead")
+    return asyncio.run_coroutine_threadsafe(coro, _LOOP).result()
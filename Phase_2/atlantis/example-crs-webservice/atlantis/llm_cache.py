@@ -0,0 +1,44 @@
+# Exact-match TTL+LRU cache for deterministic chat calls. temperature==0
+# responses are reproducible, so a cache hit replaces a full LLM generation.
+import hashlib, json, threading, time
+from collections import OrderedDict
+
+class LLMCache:
+    def __init__(self, maxsize: int = 4096, ttl: float = 3600.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        # threading (not asyncio) lock: the cache is shared between the bg
+        # loop's thread and async callers' loops, and an asyncio.Lock binds to
+        # whichever loop first awaits it. The critical sections never await,
+        # so a plain mutex is safe to hold here.
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(model: str, messages: list[dict], temperature: float, max_tokens: int) -> str | None:
+        # Sampled (temperature>0) responses are non-deterministic: never cache.
+        if temperature != 0:
+            return None
+        blob = json.dumps(
+            {"model": model, "messages": messages, "t": temperature, "mt": max_tokens},
+            sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(blob.encode()).hexdigest()
+
+    async def get(self, key: str) -> str | None:
+        with self._lock:
+            hit = self._data.get(key)
+            if hit is None:
+                return None
+            expires, value = hit
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    async def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
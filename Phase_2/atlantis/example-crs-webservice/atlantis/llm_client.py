@@ -1,34 +1,114 @@
-import os, httpx, asyncio
+import os, httpx, json, asyncio, functools, socket
+
+from ._bg_loop import run_sync
+
+_SOCK_OPTS = [(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)]
+if hasattr(socket, "TCP_QUICKACK"):
+    _SOCK_OPTS.append((socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1))
+from .llm_cache import LLMCache
+
+_CACHE = LLMCache()
+
+# Pooled clients, one per event loop: httpx connections bind to the loop they
+# were created on, and this module is used from both the bg loop (sync
+# wrappers) and callers' own loops (async APIs) in the same process.
+_CLIENTS: dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+
+def _get_client() -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    client = _CLIENTS.get(loop)
+    if client is None:
+        client = _CLIENTS[loop] = httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(max_keepalive_connections=100, max_connections=1000),
+                socket_options=_SOCK_OPTS,  # small request bodies; don't let Nagle hold them
+            ),
+            timeout=httpx.Timeout(connect=5.0, read=120.0, write=30.0, pool=5.0),
+        )
+    return client
 
 class LLMClientBase:
-    async def achat(self, messages: list[dict], temperature: float = 0.2, max_tokens: int = 2048) -> str:
+    async def achat(self, messages: list[dict], temperature: float = 0.2, max_tokens: int = 2048, stream: bool = False) -> str:
         raise NotImplementedError
     def chat(self, messages: list[dict], temperature: float = 0.2, max_tokens: int = 2048) -> str:
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-        return loop.run_until_complete(self.achat(messages, temperature, max_tokens))
+        return run_sync(self.achat(messages, temperature, max_tokens))
 
 class LLMClientOllamaGateway(LLMClientBase):
+    # Deterministic requests currently being generated, so N concurrent callers
+    # with the same prompt share one backend call instead of N. Keyed per loop:
+    # a future can only be awaited on the loop that created it, and callers
+    # arrive on both the bg loop and their own.
+    _inflight: dict[tuple[asyncio.AbstractEventLoop, str], asyncio.Future] = {}
+
     def __init__(self, base_url: str | None = None, model: str | None = None):
         self.base_url = base_url or os.getenv("LLM_GATEWAY_URL", "http://llm-gateway:8080")
         self.model = model or os.getenv("OLLAMA_MODEL", "llama3:8b")
 
-    async def achat(self, messages: list[dict], temperature: float = 0.2, max_tokens: int = 2048) -> str:
+    async def achat(self, messages: list[dict], temperature: float = 0.2, max_tokens: int = 2048, stream: bool = False) -> str:
+        key = LLMCache.key(self.model, messages, temperature, max_tokens)
+        if key is None:
+            # Sampled call: no caching or coalescing, semantics must stay per-call.
+            return await self._achat_once(messages, temperature, max_tokens, stream)
+
+        cached = await _CACHE.get(key)
+        if cached is not None:
+            return cached
+
+        loop = asyncio.get_running_loop()
+        fut = self._inflight.get((loop, key))
+        if fut is not None:
+            return await fut
+
+        fut = loop.create_future()
+        self._inflight[(loop, key)] = fut
+        try:
+            text = await self._achat_once(messages, temperature, max_tokens, stream)
+        except BaseException as e:
+            # BaseException: CancelledError included — followers already
+            # awaiting the future must never be left hanging.
+            if isinstance(e, asyncio.CancelledError):
+                fut.cancel()
+            else:
+                fut.set_exception(e)
+                fut.exception()  # leader re-raises below; avoid "never retrieved" noise
+            raise
+        else:
+            fut.set_result(text)
+            await _CACHE.set(key, text)
+            return text
+        finally:
+            del self._inflight[(loop, key)]
+
+    async def _achat_once(self, messages: list[dict], temperature: float, max_tokens: int, stream: bool) -> str:
         payload = {
             "messages": messages,
             "temperature": temperature,
             "max_tokens": max_tokens,
-            "stream": False
+            "stream": bool(stream)
         }
-        async with httpx.AsyncClient(timeout=120) as client:
-            r = await client.post(f"{self.base_url}/v1/chat/completions", json=payload)
-            r.raise_for_status()
-            data = r.json()
+        client = _get_client()
+        if stream:
+            # Gateway streams SSE deltas; concatenate as they arrive.
+            parts = []
+            async with client.stream("POST", f"{self.base_url}/v1/chat/completions", json=payload) as r:
+                r.raise_for_status()
+                async for line in r.aiter_lines():
+                    if not line.startswith("data: "):
+                        continue
+                    data = line[len("data: "):]
+                    if data == "[DONE]":
+                        break
+                    evt = json.loads(data)
+                    piece = evt["choices"][0]["delta"].get("content", "")
+                    if piece:
+                        parts.append(piece)
+            return "".join(parts)
+        r = await client.post(f"{self.base_url}/v1/chat/completions", json=payload)
+        r.raise_for_status()
+        data = r.json()
         return data["choices"][0]["message"]["content"]
 
+@functools.lru_cache(maxsize=1)
 def get_llm() -> LLMClientBase:
     provider = os.getenv("LLM_PROVIDER", "ollama")
     if provider == "ollama":
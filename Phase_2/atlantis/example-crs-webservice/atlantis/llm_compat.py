@@ -1,30 +1,31 @@
 # Provides functions that look/feel like openai.ChatCompletion(.create)
 # so we can replace calls automatically and still return familiar shapes.
-import asyncio
 from dataclasses import dataclass
 from typing import Any, List, Dict
+from ._bg_loop import run_sync
 from .llm_client import get_llm
 
-@dataclass
+_LLM = get_llm()
+
+@dataclass(slots=True)
 class _Message:
     role: str
     content: str
 
-@dataclass
+@dataclass(slots=True)
 class _Choice:
     index: int
     message: _Message
     finish_reason: str = "stop"
 
-@dataclass
+@dataclass(slots=True)
 class _Resp:
     id: str
     object: str
     choices: List[_Choice]
 
 async def a_chat_completions_create(*, model: str | None = None, messages: List[Dict[str, Any]] | None = None, **kwargs) -> _Resp:
-    llm = get_llm()
-    text = await llm.achat(messages or [], temperature=kwargs.get("temperature", 0.2), max_tokens=kwargs.get("max_tokens", 2048))
+    text = await _LLM.achat(messages or [], temperature=kwargs.get("temperature", 0.2), max_tokens=kwargs.get("max_tokens", 2048))
     return _Resp(
         id="compat-chat",
         object="chat.completion",
@@ -33,9 +34,4 @@ async def a_chat_completions_create(*, model: str | None = None, messages: List[
 
 def chat_completions_create(*, model: str | None = None, messages: List[Dict[str, Any]] | None = None, **kwargs) -> _Resp:
     # Sync wrapper for code paths that aren't async
-    try:
-        loop = asyncio.get_event_loop()
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-    return loop.run_until_complete(a_chat_completions_create(model=model, messages=messages, **kwargs))
+    return run_sync(a_chat_completions_create(model=model, messages=messages, **kwargs))
@@ -1,4 +1,10 @@
-import os, json, requests
+import os, json, socket, httpx
+
+try:
+    import orjson
+    _dumps = orjson.dumps  # emits bytes directly, no intermediate str
+except ImportError:
+    _dumps = lambda o: json.dumps(o).encode("utf-8")
 
 OLLAMA_URL = os.environ.get("OLLAMA_URL", "http://ollama:11434")
 MODEL_NAME = os.environ.get("MODEL_NAME", "llama3.1:8b-instruct-q4_K_M")
@@ -6,18 +12,27 @@ MODEL_NAME = os.environ.get("MODEL_NAME", "llama3.1:8b-instruct-q4_K_M")
 CONNECT_TO = float(os.environ.get("OLLAMA_CONNECT_TIMEOUT", "5"))
 READ_TO    = float(os.environ.get("OLLAMA_READ_TIMEOUT", "600"))
 
-def _headers():
-    return {"Content-Type": "application/json"}
+_LIMITS  = httpx.Limits(max_keepalive_connections=20, max_connections=100)
+_TIMEOUT = httpx.Timeout(connect=CONNECT_TO, read=READ_TO, write=30.0, pool=CONNECT_TO)
+# Small /api/chat bodies + Nagle = up to 40ms of sender-side buffering.
+_SOCK_OPTS = [(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)]
+if hasattr(socket, "TCP_QUICKACK"):
+    _SOCK_OPTS.append((socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1))
+# Shared clients: the Ollama connection is kept alive across requests. No
+# http2 flag — httpx only negotiates h2 via TLS ALPN, and Ollama speaks
+# plaintext HTTP/1.1 here.
+_CLIENT  = httpx.Client(
+    transport=httpx.HTTPTransport(limits=_LIMITS, socket_options=_SOCK_OPTS),
+    timeout=_TIMEOUT,
+)
+_ACLIENT = httpx.AsyncClient(
+    transport=httpx.AsyncHTTPTransport(limits=_LIMITS, socket_options=_SOCK_OPTS),
+    timeout=_TIMEOUT,
+)
 
-def chat(messages, stream=False, options=None, format=None, **kwargs):
-    """
-    Minimal Ollama /api/chat wrapper.
-    messages: list of {"role","content"}
-    options: dict of model params; we map num_predict/temperature if present
-    stream: bool -> request streaming from Ollama
-    format: "json" or None (Ollama will attempt JSON mode if supported)
-    """
-    url = f"{OLLAMA_URL}/api/chat"
+_HEADERS = {"Content-Type": "application/json"}
+
+def _payload(messages, stream, options, format):
     payload = {
         "model": MODEL_NAME,
         "messages": messages,
@@ -31,32 +46,89 @@ def chat(messages, stream=False, options=None, format=None, **kwargs):
             payload.setdefault("options", {})["num_predict"] = int(options["num_predict"])
         if "temperature" in options:
             payload.setdefault("options", {})["temperature"] = float(options["temperature"])
+    return payload
 
-    try:
-        r = requests.post(
-            url,
-            headers=_headers(),
-            data=json.dumps(payload),
-            timeout=(CONNECT_TO, READ_TO),
-        )
-        r.raise_for_status()
-        # If streaming=false, body is the final object
-        return r.json() if not stream else r.json()
-    except requests.exceptions.ReadTimeout as e:
+def _raise_mapped(e, url, r=None):
+    if isinstance(e, httpx.ReadTimeout):
         raise RuntimeError(
             f"Ollama read timeout after {READ_TO}s at {url} (model={MODEL_NAME}). "
             f"Consider lowering context size or num_predict."
         ) from e
-    except requests.exceptions.ConnectTimeout as e:
+    if isinstance(e, httpx.ConnectTimeout):
         raise RuntimeError(
             f"Ollama connect timeout after {CONNECT_TO}s at {url}. Is the ollama service reachable?"
         ) from e
-    except requests.exceptions.HTTPError as e:
+    if isinstance(e, httpx.HTTPStatusError):
         # Surface Ollama error body to caller
         try:
-            body = r.text
+            body = r.text if r is not None else e.response.text
         except Exception:
             body = "<unavailable>"
         raise RuntimeError(
-            f"Ollama HTTP {r.status_code} at {url}: {body[:400]}"
+            f"Ollama HTTP {e.response.status_code} at {url}: {body[:400]}"
         ) from e
+    raise e
+
+def chat(messages, stream=False, options=None, format=None, **kwargs):
+    """
+    Minimal Ollama /api/chat wrapper.
+    messages: list of {"role","content"}
+    options: dict of model params; we map num_predict/temperature if present
+    stream: bool -> request streaming from Ollama
+    format: "json" or None (Ollama will attempt JSON mode if supported)
+    """
+    url = f"{OLLAMA_URL}/api/chat"
+    payload = _payload(messages, stream, options, format)
+    if stream:
+        # Generator over Ollama's NDJSON lines; nothing is buffered here.
+        return _stream_lines(url, payload)
+    r = None
+    try:
+        r = _CLIENT.post(url, content=_dumps(payload), headers=_HEADERS)
+        r.raise_for_status()
+        # streaming=false: body is the final object
+        return r.json()
+    except (httpx.ReadTimeout, httpx.ConnectTimeout, httpx.HTTPStatusError) as e:
+        _raise_mapped(e, url, r)
+
+def _stream_lines(url, payload):
+    try:
+        with _CLIENT.stream("POST", url, content=_dumps(payload), headers=_HEADERS) as r:
+            r.raise_for_status()
+            for line in r.iter_lines():
+                if line:
+                    yield line
+    except (httpx.ReadTimeout, httpx.ConnectTimeout, httpx.HTTPStatusError) as e:
+        _raise_mapped(e, url)
+
+async def achat(messages, stream=False, options=None, format=None, **kwargs):
+    """
+    Async variant of chat() for callers already on the event loop
+    (e.g. the FastAPI /v1/crs/run handler) — sync requests there would
+    block the loop and serialize concurrent scans.
+    """
+    url = f"{OLLAMA_URL}/api/chat"
+    payload = _payload(messages, stream, options, format)
+    r = None
+    try:
+        r = await _ACLIENT.post(url, content=_dumps(payload), headers=_HEADERS)
+        r.raise_for_status()
+        return r.json()
+    except (httpx.ReadTimeout, httpx.ConnectTimeout, httpx.HTTPStatusError) as e:
+        _raise_mapped(e, url, r)
+
+async def astream_lines(messages, options=None, format=None, **kwargs):
+    """
+    Async generator over Ollama's NDJSON stream (stream=True), one line per
+    chunk, for handlers that forward the stream instead of buffering it.
+    """
+    url = f"{OLLAMA_URL}/api/chat"
+    payload = _payload(messages, True, options, format)
+    try:
+        async with _ACLIENT.stream("POST", url, content=_dumps(payload), headers=_HEADERS) as r:
+            r.raise_for_status()
+            async for line in r.aiter_lines():
+                if line:
+                    yield line
+    except (httpx.ReadTimeout, httpx.ConnectTimeout, httpx.HTTPStatusError) as e:
+        _raise_mapped(e, url)
@@ -1,7 +1,7 @@
 import os, json, traceback, logging
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
-from aixcc.providers.ollama_client import chat
+from fastapi.responses import JSONResponse, StreamingResponse
+from aixcc.providers.ollama_client import achat, astream_lines
 
 logging.basicConfig(level=os.environ.get("LOG_LEVEL","INFO"))
 log = logging.getLogger("atlantis-webservice")
@@ -40,21 +40,16 @@ async def run_crs(req: Request):
         messages = [{"role":"user","content":"Analyze the provided context for security issues."}]
 
     try:
-        out = chat(messages, **llm_opts)  # may be generator if stream=True
-        # If streaming, return as-is (your caller is responsible for reading)
-        if llm_opts.get("stream"):
-            # FastAPI expects a full response; for simplicity, buffer once here
-            if hasattr(out, "__iter__") and not isinstance(out, (dict, list, str)):
-                chunks = []
-                for ch in out:
-                    try:
-                        chunks.append(ch)
-                    except Exception:
-                        break
-                return JSONResponse(chunks)
-            return JSONResponse(out)
-        else:
-            return JSONResponse(out)
+        if llm_opts.pop("stream"):
+            # Forward Ollama's NDJSON lines as they arrive: constant memory,
+            # first byte leaves as soon as the first token is generated.
+            lines = astream_lines(messages, **llm_opts)
+            async def gen():
+                async for line in lines:
+                    yield line + "\n"
+            return StreamingResponse(gen(), media_type="application/x-ndjson")
+        out = await achat(messages, **llm_opts)
+        return JSONResponse(out)
     except Exception as e:
         tb = traceback.format_exc()
         log.error("run_crs failed: %s\n%s", e, tb)
@@ -1,58 +1,84 @@
 import sys, json, re
 
+try:
+    import orjson
+    _loads = orjson.loads  # Rust parser, ~3-10x stdlib on big transcripts
+except ImportError:
+    _loads = json.loads
+
 REQUIRED = {"path","cwe_guess","severity","confidence","lines","snippet","evidence","reasoning","fix"}
 
+# Compiled once; json_candidates runs per transcript in batch salvage jobs.
+# Byte patterns: the transcript stays bytes end-to-end (no full str decode),
+# and orjson/json parse bytes fragments directly.
+_RE_FENCE    = re.compile(rb"```json\s*([\s\S]*?)```", re.IGNORECASE)
+_RE_FINDINGS = re.compile(rb"\{[^{}]*\"findings\"\s*:\s*\[[\s\S]*?\][^{}]*\}")
+_RE_BRACKET  = re.compile(rb"[\[\]]")
+
 def readall(p):
-    return open(p,'r',errors='ignore').read() if p else sys.stdin.read()
+    return open(p,'rb').read() if p else sys.stdin.buffer.read()
 
-def json_candidates(text):
-    # 1) Direct top-level JSON
+def _loads_lenient(x):
     try:
-        obj=json.loads(text)
-        yield obj
+        return _loads(x)
     except Exception:
-        pass
+        # Transcripts can carry invalid UTF-8 (raw bytes inside snippets);
+        # reading used errors='ignore' before the bytes switch — keep that
+        # leniency by retrying on a tolerant decode.
+        if isinstance(x,(bytes,bytearray)):
+            return _loads(x.decode("utf-8","ignore"))
+        raise
 
-    # 2) Common wrappers: {"message":{"content":"..."}}, {"output":"..."} etc.
+def json_candidates(text):
+    # Parse the whole text once; sections 1 and 2 share the result.
     try:
-        obj=json.loads(text)
-        if isinstance(obj,dict):
-            for k in ("message","output","response","content","text"):
-                v=obj.get(k)
-                if isinstance(v,dict) and "content" in v and isinstance(v["content"],str):
-                    yield v["content"]
-                elif isinstance(v,str):
-                    yield v
+        parsed=_loads_lenient(text)
     except Exception:
-        pass
+        parsed=None
+
+    # 1) Direct top-level JSON
+    if parsed is not None:
+        yield parsed
+
+    # 2) Common wrappers: {"message":{"content":"..."}}, {"output":"..."} etc.
+    if isinstance(parsed,dict):
+        for k in ("message","output","response","content","text"):
+            v=parsed.get(k)
+            if isinstance(v,dict) and "content" in v and isinstance(v["content"],str):
+                yield v["content"]
+            elif isinstance(v,str):
+                yield v
 
     # 3) Code fences ```json ... ```
-    for m in re.finditer(r"```json\s*([\s\S]*?)```", text, re.IGNORECASE):
+    for m in _RE_FENCE.finditer(text):
         yield m.group(1)
 
     # 4) Any {... "findings":[ ... ] ...}
-    for m in re.finditer(r"\{[^{}]*\"findings\"\s*:\s*\[[\s\S]*?\][^{}]*\}", text):
+    for m in _RE_FINDINGS.finditer(text):
         yield m.group(0)
 
     # 5) All balanced arrays: grab many, not just last
     #    This is lenient: collect up to, say, 40 arrays
+    #    Scan only the bracket positions (regex engine runs in C) instead of
+    #    stepping every character of a potentially multi-MB transcript.
     arrays=[]
     stack=[]
-    for i,ch in enumerate(text):
-        if ch=='[':
-            stack.append(i)
-        elif ch==']' and stack:
+    for m in _RE_BRACKET.finditer(text):
+        if m.group()==b'[':
+            stack.append(m.start())
+        elif stack:
             start=stack.pop()
-            arrays.append(text[start:i+1])
+            arrays.append(text[start:m.start()+1])
             if len(arrays) >= 40:
                 break
     for frag in arrays:
         yield frag
 
 def load_json(x):
+    # x may be a parsed object, a str wrapper payload, or a bytes fragment
     if isinstance(x,(dict,list)): return x
     try:
-        return json.loads(x)
+        return _loads_lenient(x)
     except Exception:
         return None
 
@@ -1,29 +1,55 @@
 import sys, json, re
 
+try:
+    import orjson
+    _loads = orjson.loads  # Rust parser, ~3-10x stdlib on big transcripts
+except ImportError:
+    _loads = json.loads
+
+# Input stays bytes (no full-transcript decode); str variant is kept for the
+# wrapper-content path where the payload comes out of a parsed JSON object.
+_RE_BRACKET_B = re.compile(rb"[\[\]]")
+_RE_BRACKET_S = re.compile(r"[\[\]]")
+
 def readall(p):
-    return open(p,'r',errors='ignore').read() if p else sys.stdin.read()
+    return open(p,'rb').read() if p else sys.stdin.buffer.read()
+
+def _loads_lenient(x):
+    try:
+        return _loads(x)
+    except Exception:
+        # Fragments can carry invalid UTF-8 (raw bytes in snippets); reading
+        # used errors='ignore' before the bytes switch — keep that leniency
+        # by retrying on a tolerant decode.
+        if isinstance(x,(bytes,bytearray)):
+            return _loads(x.decode("utf-8","ignore"))
+        raise
 
 def last_array(text):
+    # Iterate bracket positions only (regex in C) rather than every character.
+    is_bytes=isinstance(text,bytes)
+    pat=_RE_BRACKET_B if is_bytes else _RE_BRACKET_S
+    opener=b'[' if is_bytes else '['
     start=None; depth=0; last=None
-    for i,ch in enumerate(text):
-        if ch=='[':
-            if depth==0: start=i
+    for m in pat.finditer(text):
+        if m.group()==opener:
+            if depth==0: start=m.start()
             depth+=1
-        elif ch==']':
+        else:
             if depth>0:
                 depth-=1
                 if depth==0 and start is not None:
-                    last=(start,i+1)
+                    last=(start,m.start()+1)
     if not last: return None
     frag=text[last[0]:last[1]]
     try:
-        arr=json.loads(frag)
+        arr=_loads_lenient(frag)
         return arr if isinstance(arr,list) else None
     except: return None
 
 def try_message_content(s):
     try:
-        obj=json.loads(s)
+        obj=_loads_lenient(s)
         if isinstance(obj,dict):
             msg=obj.get("message") or {}
             c=msg.get("content")
@@ -37,7 +63,7 @@ def try_message_content(s):
 
 def try_top_struct(s):
     try:
-        obj=json.loads(s)
+        obj=_loads_lenient(s)
         if isinstance(obj,list): return obj
         if isinstance(obj,dict) and isinstance(obj.get("findings"),list):
             return obj["findings"]
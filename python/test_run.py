@@ -20,15 +20,68 @@ Usage examples
 """
 
 import argparse
+import asyncio
+import functools
+import io
 import json
+import os
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, Optional
 
 import boto3
 from botocore.config import Config
 from botocore.exceptions import ClientError, NoCredentialsError, PartialCredentialsError, EndpointConnectionError
 
+try:
+    # Optional: lets us overlap the STS / model-catalog / runtime round-trips.
+    from aiobotocore.session import AioSession
+    HAVE_AIOBOTOCORE = True
+except ImportError:
+    HAVE_AIOBOTOCORE = False
+
+try:
+    # Optional: faster encode (straight to bytes) and per-chunk decode.
+    import orjson
+    HAVE_ORJSON = True
+
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def _loads(data):
+        return orjson.loads(data)
+
+    def _pretty(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    HAVE_ORJSON = False
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    def _loads(data):
+        return json.loads(data)
+
+    def _pretty(obj: Any) -> str:
+        return json.dumps(obj, indent=2)
+
+try:
+    # Optional: incremental extraction of just the text fields from big chunks.
+    import ijson
+except ImportError:
+    ijson = None
+
+# Below this size a full _loads is cheaper than ijson's event stream; against
+# orjson's C parser the crossover sits far higher than against stdlib json.
+_IJSON_MIN_CHUNK = 262144 if HAVE_ORJSON else 8192
+
+# Preflight responses (STS identity, model catalog) are static for a given
+# profile/region on the scale of hours; memoize them to disk so warm runs skip
+# both network round-trips. Best-effort: any I/O error just means a cold call.
+CACHE_PATH = os.path.expanduser("~/.cache/atlantis/bedrock_preflight.json")
+CACHE_TTL = 3600.0
+
 EXIT_OK = 0
 EXIT_NO_CREDS = 10
 EXIT_PARTIAL_CREDS = 11
@@ -41,30 +94,65 @@ def log(msg: str) -> None:
     print(msg, file=sys.stderr)
 
 
+def _cache_load() -> Dict[str, Any]:
+    try:
+        with open(CACHE_PATH) as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def cache_get(kind: str, profile: Optional[str], region: str) -> Optional[Any]:
+    entry = _cache_load().get(f"{kind}:{profile or ''}:{region}")
+    if not entry or time.time() - entry.get("ts", 0) > CACHE_TTL:
+        return None
+    return entry.get("value")
+
+
+def cache_set(kind: str, profile: Optional[str], region: str, value: Any) -> None:
+    data = _cache_load()
+    data[f"{kind}:{profile or ''}:{region}"] = {"ts": time.time(), "value": value}
+    try:
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        with open(CACHE_PATH, "w") as f:
+            json.dump(data, f)
+    except OSError:
+        pass
+
+
 def get_session(profile: Optional[str]) -> boto3.Session:
     if profile:
         return boto3.Session(profile_name=profile)
     return boto3.Session()
 
 
-def validate_creds(session: boto3.Session, region: str) -> Dict[str, str]:
-    sts = session.client("sts", region_name=region)
+@functools.lru_cache(maxsize=None)
+def get_runtime_client(session: boto3.Session, region: str, cfg: Config):
+    # Keyed by identity (neither Session nor Config defines __eq__), so repeat
+    # callers within one run share a single client and its connection pool.
+    return session.client("bedrock-runtime", region_name=region, config=cfg)
+
+
+def validate_creds(session: boto3.Session, region: str, cfg: Config) -> Dict[str, str]:
+    sts = session.client("sts", region_name=region, config=cfg)
     ident = sts.get_caller_identity()
     return {"Account": ident["Account"], "Arn": ident["Arn"], "UserId": ident["UserId"]}
 
 
-def list_foundation_models(session: boto3.Session, region: str) -> Optional[list]:
+def list_foundation_models(session: boto3.Session, region: str, cfg: Config) -> Optional[list]:
     """
     Best-effort: not all principals/regions allow this call.
     If denied, we just return None (non-fatal for our test).
+    Returns model IDs only — that is all the caller checks, and it keeps the
+    disk cache tiny.
     """
     try:
-        bedrock = session.client("bedrock", region_name=region)
+        bedrock = session.client("bedrock", region_name=region, config=cfg)
         # limit the noise: only return the first page
         resp = bedrock.list_foundation_models(
             byOutputModality="TEXT"  # keeps it quick & relevant
         )
-        return resp.get("modelSummaries", [])
+        return [m.get("modelId") for m in resp.get("modelSummaries", [])]
     except ClientError as e:
         # AccessDenied or Unsupported region ≠ fatal for runtime testing
         code = e.response.get("Error", {}).get("Code", "")
@@ -72,40 +160,29 @@ def list_foundation_models(session: boto3.Session, region: str) -> Optional[list
         return None
 
 
-def provider_from_model_id(model_id: str) -> str:
-    """
-    Very lightweight provider detection to choose payload/parse logic.
-    """
-    mid = model_id.lower()
-    if mid.startswith("amazon.titan"):
-        return "titan"
-    if "anthropic" in mid or mid.startswith("anthropic."):
-        return "anthropic"
-    return "generic"
-
-
-def build_request_body(provider: str, prompt: str, max_tokens: int, temperature: float) -> Dict[str, Any]:
-    """
-    Shape the request body for common providers.
-    """
-    if provider == "titan":
-        return {
-            "inputText": prompt,
-            "textGenerationConfig": {
-                "maxTokenCount": max_tokens,
-                "temperature": temperature
-            }
-        }
-    if provider == "anthropic":
-        # Bedrock Anthropic Messages format
-        return {
-            "anthropic_version": "bedrock-2023-05-31",
-            "messages": [
-                {"role": "user", "content": [{"type": "text", "text": prompt}]}
-            ],
-            "max_tokens": max_tokens,
+def build_titan(prompt: str, max_tokens: int, temperature: float) -> Dict[str, Any]:
+    return {
+        "inputText": prompt,
+        "textGenerationConfig": {
+            "maxTokenCount": max_tokens,
             "temperature": temperature
         }
+    }
+
+
+def build_anthropic(prompt: str, max_tokens: int, temperature: float) -> Dict[str, Any]:
+    # Bedrock Anthropic Messages format
+    return {
+        "anthropic_version": "bedrock-2023-05-31",
+        "messages": [
+            {"role": "user", "content": [{"type": "text", "text": prompt}]}
+        ],
+        "max_tokens": max_tokens,
+        "temperature": temperature
+    }
+
+
+def build_generic(prompt: str, max_tokens: int, temperature: float) -> Dict[str, Any]:
     # Generic fallback — many providers accept something like this, but output parsing will be generic too.
     return {
         "prompt": prompt,
@@ -114,51 +191,125 @@ def build_request_body(provider: str, prompt: str, max_tokens: int, temperature:
     }
 
 
-def parse_response(provider: str, resp_json: Dict[str, Any]) -> str:
-    """
-    Extract plain text from known schemas; otherwise pretty-print JSON.
-    """
-    if provider == "titan":
-        # Titan text returns: {"results":[{"outputText": "...", "tokenCount": {...}}], ...}
-        try:
-            return resp_json["results"][0]["outputText"]
-        except Exception:
-            return json.dumps(resp_json, indent=2)
+def parse_titan(resp_json: Dict[str, Any]) -> str:
+    # Titan text returns: {"results":[{"outputText": "...", "tokenCount": {...}}], ...}
+    try:
+        return resp_json["results"][0]["outputText"]
+    except Exception:
+        return _pretty(resp_json)
 
-    if provider == "anthropic":
-        # Anthropic messages returns: {"content":[{"type":"text","text":"..."}], ...}
-        try:
-            parts = resp_json.get("content", [])
-            texts = [p.get("text", "") for p in parts if p.get("type") == "text"]
-            if texts:
-                return "\n".join(t for t in texts if t)
-            return json.dumps(resp_json, indent=2)
-        except Exception:
-            return json.dumps(resp_json, indent=2)
 
+def parse_anthropic(resp_json: Dict[str, Any]) -> str:
+    # Anthropic messages returns: {"content":[{"type":"text","text":"..."}], ...}
+    try:
+        parts = resp_json.get("content", [])
+        texts = [p.get("text", "") for p in parts if p.get("type") == "text"]
+        if texts:
+            return "\n".join(t for t in texts if t)
+        return _pretty(resp_json)
+    except Exception:
+        return _pretty(resp_json)
+
+
+def parse_generic(resp_json: Dict[str, Any]) -> str:
     # Generic: just JSON
-    return json.dumps(resp_json, indent=2)
+    return _pretty(resp_json)
+
+
+def extract_titan_stream(j: Dict[str, Any]) -> str:
+    # Titan stream emits {"outputText": "...", ...} fragments or similar.
+    return j.get("outputText") or ""
+
+
+def extract_anthropic_stream(j: Dict[str, Any]) -> str:
+    # anthropic deltas might look like {"delta":{"type":"text_delta","text":"..."}}
+    delta = j.get("delta")
+    if isinstance(delta, dict) and "text" in delta:
+        return delta["text"]
+    # sometimes content arrays with text nodes appear
+    content = j.get("content")
+    if isinstance(content, list):
+        return "".join(c.get("text", "") for c in content if c.get("type") == "text")
+    return ""
+
+
+def extract_generic_stream(j: Dict[str, Any]) -> str:
+    # Unknown provider: probe every shape we know.
+    return extract_titan_stream(j) or extract_anthropic_stream(j)
+
+
+# One table drives payload build, response parse, and stream extraction, so
+# the per-chunk hot loop calls its extractor directly instead of re-branching
+# on the provider string.
+PROVIDERS = {
+    "amazon.titan": ("titan", build_titan, parse_titan, extract_titan_stream),
+    "anthropic": ("anthropic", build_anthropic, parse_anthropic, extract_anthropic_stream),
+}
+_DEFAULT = ("generic", build_generic, parse_generic, extract_generic_stream)
 
 
-def invoke_non_stream(client, model_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+def dispatch(model_id: str):
+    """
+    (name, build, parse, stream_extract) for a model id; generic fallback.
+    """
+    mid = model_id.lower()
+    for prefix, fns in PROVIDERS.items():
+        if prefix in mid:
+            return fns
+    return _DEFAULT
+
+
+def invoke_non_stream(client, model_id: str, body_bytes: bytes) -> Dict[str, Any]:
     resp = client.invoke_model(
         modelId=model_id,
-        body=json.dumps(body).encode("utf-8"),
+        body=body_bytes,
         contentType="application/json",
         accept="application/json",
     )
     resp_body = resp["body"].read().decode("utf-8")
-    return json.loads(resp_body)
+    return _loads(resp_body)
 
 
-def invoke_stream(client, model_id: str, body: Dict[str, Any]):
+def _stream_chunk_text(data: bytes, extract=extract_generic_stream) -> str:
     """
-    Yields text chunks (best-effort). Exact stream shape varies by provider.
-    We try to parse payloads as JSON per event chunk, and print text if obvious.
+    Best-effort text extraction from one streamed event payload.
+    Takes the raw chunk bytes — json/orjson both parse bytes directly, so the
+    common path skips a per-chunk UTF-8 decode. Exact stream shape varies by
+    provider; non-JSON chunks pass through (decoded only then).
+    """
+    if ijson is not None and len(data) > _IJSON_MIN_CHUNK:
+        # Some providers re-send the whole growing message object per event;
+        # walk it once (a single parse pass covers all known text prefixes)
+        # and materialize only the text fields.
+        buf = data if isinstance(data, bytes) else data.encode("utf-8")
+        try:
+            fragments = []
+            for prefix, event, value in ijson.parse(io.BytesIO(buf)):
+                if event != "string":
+                    continue
+                if prefix in ("outputText", "delta.text"):
+                    return value
+                if prefix == "content.item.text":
+                    fragments.append(value)
+            return "".join(fragments)
+        except Exception:
+            pass  # unrecognized/invalid: fall through to the full-parse probe
+    try:
+        j = _loads(data)
+    except Exception:
+        # Not JSON: just push raw
+        return data.decode("utf-8", "replace") if isinstance(data, bytes) else data
+    # If structure unknown, yield empty (but keep the stream readable)
+    return extract(j) or ""
+
+
+def invoke_stream(client, model_id: str, body_bytes: bytes, extract=extract_generic_stream):
+    """
+    Yields text chunks (best-effort); see _stream_chunk_text for parsing.
     """
     stream = client.invoke_model_with_response_stream(
         modelId=model_id,
-        body=json.dumps(body).encode("utf-8"),
+        body=body_bytes,
         contentType="application/json",
         accept="application/json",
     )["body"]
@@ -167,38 +318,183 @@ def invoke_stream(client, model_id: str, body: Dict[str, Any]):
         # Each event has 'chunk' with bytes; content varies by provider.
         if "chunk" not in event:
             continue
-        data = event["chunk"]["bytes"].decode("utf-8")
-        # Try JSON first; fallback to raw text
-        try:
-            j = json.loads(data)
-            # Titan stream example emits {"outputText": "...", ...} fragments or similar.
-            # Anthropic streamed messages emit delta-like objects.
-            text = None
-            if "outputText" in j:
-                text = j["outputText"]
-            elif "delta" in j:
-                # anthropic deltas might look like {"delta":{"type":"text_delta","text":"..."}}
-                delta = j["delta"]
-                if isinstance(delta, dict) and "text" in delta:
-                    text = delta["text"]
-            elif "content" in j and isinstance(j["content"], list):
-                # sometimes content arrays with text nodes appear
-                fragments = [c.get("text", "") for c in j["content"] if c.get("type") == "text"]
-                text = "".join(fragments)
-            if text:
-                yield text
-            else:
-                # If structure unknown, yield raw chunk (but keep it readable)
-                yield ""
-        except Exception:
-            # Not JSON: just push raw
-            yield data
+        yield _stream_chunk_text(event["chunk"]["bytes"], extract)
+
+
+async def validate_creds_async(session: "AioSession", region: str, cfg: Config) -> Dict[str, str]:
+    async with session.create_client("sts", region_name=region, config=cfg) as sts:
+        ident = await sts.get_caller_identity()
+    return {"Account": ident["Account"], "Arn": ident["Arn"], "UserId": ident["UserId"]}
+
+
+async def list_foundation_models_async(session: "AioSession", region: str, cfg: Config) -> Optional[list]:
+    try:
+        async with session.create_client("bedrock", region_name=region, config=cfg) as bedrock:
+            resp = await bedrock.list_foundation_models(byOutputModality="TEXT")
+        return [m.get("modelId") for m in resp.get("modelSummaries", [])]
+    except ClientError as e:
+        code = e.response.get("Error", {}).get("Code", "")
+        log(f"[warn] Could not list foundation models ({code}). Continuing.")
+        return None
+
+
+async def invoke_non_stream_async(client, model_id: str, body_bytes: bytes) -> Dict[str, Any]:
+    resp = await client.invoke_model(
+        modelId=model_id,
+        body=body_bytes,
+        contentType="application/json",
+        accept="application/json",
+    )
+    resp_body = await resp["body"].read()
+    return _loads(resp_body)
+
+
+async def invoke_stream_async(client, model_id: str, body_bytes: bytes, extract=extract_generic_stream):
+    resp = await client.invoke_model_with_response_stream(
+        modelId=model_id,
+        body=body_bytes,
+        contentType="application/json",
+        accept="application/json",
+    )
+    async for event in resp["body"]:
+        if "chunk" not in event:
+            continue
+        yield _stream_chunk_text(event["chunk"]["bytes"], extract)
+
+
+def read_prompts(path: str) -> list:
+    with open(path, "r", encoding="utf-8") as f:
+        return [ln.strip() for ln in f if ln.strip()]
+
+
+async def run_prompt_batch_async(brt, args, build, parse) -> int:
+    """
+    Fan a prompt file out through bounded-concurrency invokes; one shared
+    client amortizes session/TLS setup across all prompts. Emits JSONL keyed
+    by prompt index (gather preserves submission order).
+    """
+    prompts = read_prompts(args.prompt_file)
+    log(f"[info] Running {len(prompts)} prompts (concurrency={args.concurrency})…")
+    t0 = time.perf_counter()
+    sem = asyncio.Semaphore(max(1, args.concurrency))
+
+    async def one(i: int, prompt: str):
+        # Serialized once up front; botocore reuses the same bytes on retries.
+        body_bytes = _dumps(build(prompt, args.max_tokens, args.temperature))
+        async with sem:
+            resp_json = await invoke_non_stream_async(brt, args.model_id, body_bytes)
+        return i, parse(resp_json)
+
+    try:
+        results = await asyncio.gather(*(one(i, p) for i, p in enumerate(prompts)))
+    except ClientError as e:
+        log(f"[error] Batch invoke failed: {e}")
+        return EXIT_CLIENT_ERR
+    for i, text in results:
+        print(json.dumps({"index": i, "prompt": prompts[i], "output": text}))
+    elapsed = (time.perf_counter() - t0) * 1000
+    log(f"[ok] Batch of {len(prompts)} completed in {elapsed:.0f} ms.")
+    return EXIT_OK
+
+
+async def amain(args, cfg: Config) -> int:
+    session = AioSession(profile=args.profile) if args.profile else AioSession()
+
+    # 1+2) Preflight: serve from the disk cache when warm, and overlap the STS
+    #      check and the model catalog peek (opt-in via --verify-model) on
+    #      misses instead of paying two sequential round-trips.
+    log("[info] Validating credentials via STS…")
+    ident = None if args.no_cache else cache_get("sts", args.profile, args.region)
+    ident_cached = ident is not None
+    _models = None
+    if args.verify_model and not args.no_cache:
+        _models = cache_get("models", args.profile, args.region)
+    models_cached = _models is not None
+    if not ident_cached and args.verify_model and not models_cached:
+        ident, _models = await asyncio.gather(
+            validate_creds_async(session, args.region, cfg),
+            list_foundation_models_async(session, args.region, cfg),
+        )
+    elif not ident_cached:
+        ident = await validate_creds_async(session, args.region, cfg)
+    elif args.verify_model and not models_cached:
+        _models = await list_foundation_models_async(session, args.region, cfg)
+    if not args.no_cache:
+        if not ident_cached:
+            cache_set("sts", args.profile, args.region, ident)
+        if not models_cached and _models is not None:
+            cache_set("models", args.profile, args.region, _models)
+    log(f"[ok] Account: {ident['Account']} | ARN: {ident['Arn']}")
+    if args.verify_model:
+        if _models is not None:
+            present = args.model_id in _models
+            log(f"[ok] Model list accessible. Model present in list: {present}")
+        else:
+            log("[warn] Skipping model list verification (no access or unsupported).")
+
+    # 3) Runtime invoke
+    async with session.create_client("bedrock-runtime", region_name=args.region, config=cfg) as brt:
+        provider, build, parse, extract = dispatch(args.model_id)
+
+        if args.prompt_file:
+            return await run_prompt_batch_async(brt, args, build, parse)
+
+        body_bytes = _dumps(build(args.prompt, args.max_tokens, args.temperature))
+
+        log(f"[info] Invoking {args.model_id} (provider={provider}, stream={args.stream})…")
+        t0 = time.perf_counter()
+
+        if args.stream:
+            # Write chunk bytes straight to the raw stdout buffer: print() would
+            # re-encode and flush per token, which adds up at high token rates.
+            # Flushes are batched on a ~50 ms clock instead.
+            collected = bytearray()
+            out = sys.stdout.buffer
+            last_flush = time.monotonic()
+            try:
+                async for chunk in invoke_stream_async(brt, args.model_id, body_bytes, extract):
+                    if chunk:
+                        data = chunk.encode("utf-8")
+                        collected += data
+                        out.write(data)
+                        if time.monotonic() - last_flush > 0.05:
+                            out.flush()
+                            last_flush = time.monotonic()
+                out.write(b"\n")
+                out.flush()
+            except ClientError as e:
+                log(f"[error] Streaming invoke failed: {e}")
+                return EXIT_CLIENT_ERR
+            elapsed = (time.perf_counter() - t0) * 1000
+            log(f"[ok] Stream completed in {elapsed:.0f} ms.")
+            if args.json:
+                log("[info] Raw stream output not retained as structured JSON (varies by provider).")
+        else:
+            try:
+                resp_json = await invoke_non_stream_async(brt, args.model_id, body_bytes)
+            except ClientError as e:
+                log(f"[error] Invoke failed: {e}")
+                return EXIT_CLIENT_ERR
+            elapsed = (time.perf_counter() - t0) * 1000
+            parsed = parse(resp_json)
+            print("----- Parsed Output -----")
+            print(parsed)
+            print("-------------------------")
+            log(f"[ok] Non-stream invoke completed in {elapsed:.0f} ms.")
+            if args.json:
+                print("----- Raw JSON -----")
+                print(_pretty(resp_json))
+                print("--------------------")
+
+    return EXIT_OK
 
 
 def main():
     ap = argparse.ArgumentParser(description="Thorough Bedrock runtime test")
     ap.add_argument("--model-id", required=True, help="Bedrock model ID (e.g., amazon.titan-text-lite-v1)")
-    ap.add_argument("--prompt", required=True, help="Prompt to send to the model")
+    ap.add_argument("--prompt", default=None, help="Prompt to send to the model")
+    ap.add_argument("--prompt-file", default=None, help="File with one prompt per line; runs them concurrently, emits JSONL")
+    ap.add_argument("--concurrency", type=int, default=4, help="Max in-flight model calls in --prompt-file mode")
     ap.add_argument("--region", default="us-east-1", help="AWS region (default: us-east-1)")
     ap.add_argument("--profile", default=None, help="AWS named profile to use")
     ap.add_argument("--max-tokens", type=int, default=512, help="Max tokens / length")
@@ -207,51 +503,115 @@ def main():
     ap.add_argument("--json", action="store_true", help="Print raw JSON response in addition to parsed text")
     ap.add_argument("--timeout", type=int, default=30, help="Socket read timeout (seconds)")
     ap.add_argument("--retries", type=int, default=3, help="Max retry attempts on throttling/5xx")
+    ap.add_argument("--no-cache", action="store_true", help="Skip the on-disk preflight cache")
+    ap.add_argument("--verify-model", action="store_true",
+                    help="Check the model catalog for --model-id before invoking (extra RTT)")
     args = ap.parse_args()
+    if not args.prompt and not args.prompt_file:
+        ap.error("one of --prompt or --prompt-file is required")
 
     # Configure robust retry/timeout behavior for botocore
     cfg = Config(
         retries={"max_attempts": max(1, args.retries), "mode": "standard"},
         read_timeout=max(5, args.timeout),
         connect_timeout=10,
+        max_pool_connections=max(10, args.concurrency),
     )
 
     try:
+        if HAVE_AIOBOTOCORE:
+            # Async path: collapses the sequential preflight RTTs to one.
+            sys.exit(asyncio.run(amain(args, cfg)))
+
         session = get_session(args.profile)
 
-        # 1) Creds smoke test
+        # 1+2) Preflight: creds smoke test + model catalog peek (opt-in via
+        #      --verify-model), both disk-cached per profile/region. On a
+        #      double miss the two calls run in parallel threads — boto3
+        #      releases the GIL inside the socket layer, so this genuinely
+        #      overlaps the round-trips.
         log("[info] Validating credentials via STS…")
-        ident = validate_creds(session, args.region)
+        ident = None if args.no_cache else cache_get("sts", args.profile, args.region)
+        ident_cached = ident is not None
+        _models = None
+        if args.verify_model and not args.no_cache:
+            _models = cache_get("models", args.profile, args.region)
+        models_cached = _models is not None
+        if not ident_cached and args.verify_model and not models_cached:
+            with ThreadPoolExecutor(max_workers=2) as ex:
+                f_id = ex.submit(validate_creds, session, args.region, cfg)
+                f_m = ex.submit(list_foundation_models, session, args.region, cfg)
+                ident = f_id.result()
+                _models = f_m.result()
+        elif not ident_cached:
+            ident = validate_creds(session, args.region, cfg)
+        elif args.verify_model and not models_cached:
+            _models = list_foundation_models(session, args.region, cfg)
+        if not args.no_cache:
+            if not ident_cached:
+                cache_set("sts", args.profile, args.region, ident)
+            if not models_cached and _models is not None:
+                cache_set("models", args.profile, args.region, _models)
         log(f"[ok] Account: {ident['Account']} | ARN: {ident['Arn']}")
 
-        # 2) Optional model catalog peek (non-fatal if denied)
-        log("[info] Checking (best-effort) model catalog visibility…")
-        _models = list_foundation_models(session, args.region)
-        if _models is not None:
-            # Quick check if our model id looks present
-            present = any(m.get("modelId") == args.model_id for m in _models)
-            log(f"[ok] Model list accessible. Model present in list: {present}")
-        else:
-            log("[warn] Skipping model list verification (no access or unsupported).")
+        if args.verify_model:
+            if _models is not None:
+                # Quick check if our model id looks present
+                present = args.model_id in _models
+                log(f"[ok] Model list accessible. Model present in list: {present}")
+            else:
+                log("[warn] Skipping model list verification (no access or unsupported).")
 
         # 3) Runtime invoke
-        brt = session.client("bedrock-runtime", region_name=args.region, config=cfg)
-        provider = provider_from_model_id(args.model_id)
-        body = build_request_body(provider, args.prompt, args.max_tokens, args.temperature)
+        brt = get_runtime_client(session, args.region, cfg)
+        provider, build, parse, extract = dispatch(args.model_id)
+
+        if args.prompt_file:
+            # Sync fallback: botocore's connection pool is thread-safe, so a
+            # small thread pool still overlaps the network waits.
+            prompts = read_prompts(args.prompt_file)
+            log(f"[info] Running {len(prompts)} prompts (concurrency={args.concurrency})…")
+            t0 = time.perf_counter()
+
+            def one(item):
+                i, prompt = item
+                body_bytes = _dumps(build(prompt, args.max_tokens, args.temperature))
+                return i, parse(invoke_non_stream(brt, args.model_id, body_bytes))
+
+            try:
+                with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as ex:
+                    for i, text in ex.map(one, enumerate(prompts)):
+                        print(json.dumps({"index": i, "prompt": prompts[i], "output": text}))
+            except ClientError as e:
+                log(f"[error] Batch invoke failed: {e}")
+                sys.exit(EXIT_CLIENT_ERR)
+            elapsed = (time.perf_counter() - t0) * 1000
+            log(f"[ok] Batch of {len(prompts)} completed in {elapsed:.0f} ms.")
+            sys.exit(EXIT_OK)
+
+        body_bytes = _dumps(build(args.prompt, args.max_tokens, args.temperature))
 
         log(f"[info] Invoking {args.model_id} (provider={provider}, stream={args.stream})…")
         t0 = time.perf_counter()
 
         if args.stream:
-            # Stream and collect for a final summary
-            collected = []
+            # Stream and collect for a final summary. Chunk bytes go straight
+            # to the raw stdout buffer with ~50 ms batched flushes; print()
+            # would re-encode and flush on every token.
+            collected = bytearray()
+            out = sys.stdout.buffer
+            last_flush = time.monotonic()
             try:
-                for chunk in invoke_stream(brt, args.model_id, body):
+                for chunk in invoke_stream(brt, args.model_id, body_bytes, extract):
                     if chunk:
-                        collected.append(chunk)
-                        # Print incrementally for live feel
-                        print(chunk, end="", flush=True)
-                print()  # newline after stream
+                        data = chunk.encode("utf-8")
+                        collected += data
+                        out.write(data)
+                        if time.monotonic() - last_flush > 0.05:
+                            out.flush()
+                            last_flush = time.monotonic()
+                out.write(b"\n")  # newline after stream
+                out.flush()
             except ClientError as e:
                 log(f"[error] Streaming invoke failed: {e}")
                 sys.exit(EXIT_CLIENT_ERR)
@@ -262,13 +622,13 @@ def main():
                 log("[info] Raw stream output not retained as structured JSON (varies by provider).")
         else:
             try:
-                resp_json = invoke_non_stream(brt, args.model_id, body)
+                resp_json = invoke_non_stream(brt, args.model_id, body_bytes)
             except ClientError as e:
                 log(f"[error] Invoke failed: {e}")
                 sys.exit(EXIT_CLIENT_ERR)
 
             elapsed = (time.perf_counter() - t0) * 1000
-            parsed = parse_response(provider, resp_json)
+            parsed = parse(resp_json)
 
             print("----- Parsed Output -----")
             print(parsed)
@@ -277,7 +637,7 @@ def main():
 
             if args.json:
                 print("----- Raw JSON -----")
-                print(json.dumps(resp_json, indent=2))
+                print(_pretty(resp_json))
                 print("--------------------")
 
         sys.exit(EXIT_OK)